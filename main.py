@@ -1,24 +1,185 @@
+import asyncio
+import inspect
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, List, Optional
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import InMemoryRunner
+from google.genai.types import Part, UserContent
+
 from multi_tool_agent.agent import root_agent
+from multi_tool_agent.router import fast_route, speculate
+
+APP_NAME = "wellness"
+USER_ID = "example_user"
+
+# Maximum number of agent responses kept in the prompt cache
+RESPONSE_CACHE_SIZE = 256
+
+EXAMPLE_QUERIES = [
+    ("Example mortgage calculation:", "Calculate monthly payment for a $300,000 loan with 4.5% interest over 30 years"),
+    ("Example currency conversion:", "Convert 100 USD to EUR"),
+]
+
+
+async def create_session(runner: InMemoryRunner):
+    """Create a session, supporting both sync and async session services."""
+    session = runner.session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    if inspect.isawaitable(session):
+        session = await session
+    return session
+
+
+def normalize_prompt(message: str) -> str:
+    """Collapse whitespace and case so trivially different prompts share a cache entry."""
+    return " ".join(message.split()).casefold()
+
+
+async def stream_agent(runner: InMemoryRunner, prompt: str) -> AsyncIterator[str]:
+    """Send a prompt to the agent in a fresh session and yield response text as it is generated."""
+    session = await create_session(runner)
+    streamed = False
+    async for event in runner.run_async(
+        user_id=USER_ID,
+        session_id=session.id,
+        new_message=UserContent(parts=[Part(text=prompt)]),
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+    ):
+        if not (event.content and event.content.parts):
+            continue
+        text = "".join(part.text or "" for part in event.content.parts)
+        if event.partial:
+            streamed = True
+            yield text
+        else:
+            # The closing event of a streamed turn repeats the text already yielded
+            if not streamed and text:
+                yield text
+            streamed = False
+
+
+class ResponseStream:
+    """Agent response that any number of readers can replay from the start while it is still streaming."""
+
+    def __init__(self, chunks: AsyncIterator[str], on_failure: Optional[Callable[[], None]] = None):
+        self._chunks: List[str] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._on_failure = on_failure
+        self._updated = asyncio.Condition()
+        self._task = asyncio.ensure_future(self._fill(chunks))
+
+    async def _fill(self, chunks: AsyncIterator[str]) -> None:
+        completed = False
+        try:
+            async for chunk in chunks:
+                async with self._updated:
+                    self._chunks.append(chunk)
+                    self._updated.notify_all()
+            completed = True
+        except Exception as e:
+            self._error = e
+        finally:
+            if not completed and self._on_failure is not None:
+                self._on_failure()
+            async with self._updated:
+                self._done = True
+                self._updated.notify_all()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        read = 0
+        while True:
+            async with self._updated:
+                await self._updated.wait_for(lambda: read < len(self._chunks) or self._done)
+                new_chunks = self._chunks[read:]
+                done = self._done
+            for chunk in new_chunks:
+                yield chunk
+            read += len(new_chunks)
+            if done and read == len(self._chunks):
+                break
+        if self._error is not None:
+            raise self._error
+
+
+def cached_response(
+    runner: InMemoryRunner, cache: "OrderedDict[str, ResponseStream]", message: str
+) -> ResponseStream:
+    """Memoize agent responses from one runner per normalized prompt.
+
+    The cache belongs to the caller that owns the runner, so it is dropped
+    together with the runner and its event loop. The original message is
+    what the model sees; only the cache key is normalized. The cached stream
+    can be replayed any number of times, so identical queries issued
+    concurrently also share a single LLM round-trip. A response that fails
+    is evicted so the next identical query retries.
+    """
+    key = normalize_prompt(message)
+    stream = cache.get(key)
+    if stream is not None:
+        cache.move_to_end(key)
+        return stream
+
+    def evict() -> None:
+        if cache.get(key) is stream:
+            del cache[key]
+
+    # The prompt will reach the model, so start the likely tool call now
+    # and have its result ready when the model asks for it
+    speculate(message)
+    stream = ResponseStream(stream_agent(runner, message), on_failure=evict)
+    cache[key] = stream
+    while len(cache) > RESPONSE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return stream
+
+
+async def run_one(
+    runner: InMemoryRunner,
+    cache: "OrderedDict[str, ResponseStream]",
+    console: asyncio.Lock,
+    label: str,
+    message: str,
+):
+    """Run a single query through the shared runner and print the response as it streams in."""
+    # Simple single-tool queries are answered locally without an LLM round-trip
+    text = fast_route(message)
+    if text is not None:
+        async with console:
+            print(f"\n{label}")
+            print(text)
+        return
+
+    chunks = cached_response(runner, cache, message).__aiter__()
+
+    # Claim the console only once there is something to show, so responses
+    # are printed in the order they start arriving and never interleave
+    first_chunk = await anext(chunks, "")
+    async with console:
+        print(f"\n{label}")
+        print(first_chunk, end="", flush=True)
+        async for chunk in chunks:
+            print(chunk, end="", flush=True)
+        print()
+
+
+async def run_examples():
+    # Build the runner once and reuse it for every query
+    runner = InMemoryRunner(app_name=APP_NAME, agent=root_agent)
+    # Responses are cached for the lifetime of this runner only
+    cache: "OrderedDict[str, ResponseStream]" = OrderedDict()
+    console = asyncio.Lock()
+
+    # The example queries are independent, so issue them concurrently;
+    # later responses keep streaming into their buffers while one is printed
+    await asyncio.gather(*(run_one(runner, cache, console, label, message) for label, message in EXAMPLE_QUERIES))
+
 
 def main():
     print("Financial Assistant Agent is running!")
-    
+
     # Example of using the agent
-    print("\nExample mortgage calculation:")
-    response = root_agent.generate(
-        messages=[
-            {"role": "user", "content": "Calculate monthly payment for a $300,000 loan with 4.5% interest over 30 years"}
-        ]
-    )
-    print(response.text)
-    
-    print("\nExample currency conversion:")
-    response = root_agent.generate(
-        messages=[
-            {"role": "user", "content": "Convert 100 USD to EUR"}
-        ]
-    )
-    print(response.text)
+    asyncio.run(run_examples())
 
 
 if __name__ == "__main__":
@@ -1,7 +1,38 @@
-import datetime
-from zoneinfo import ZoneInfo
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Any
+import numpy as np
 from google.adk.agents import Agent
+from google.genai import types as genai_types
+from numba import float64, int64, njit, types, void
+
+from .speculation import use_speculated_result
+
+
+@dataclass(slots=True, frozen=True)
+class ToolResult:
+    """Result of a tool: a status plus either a report or an error message.
+
+    Tools build one and return its asdict(), the Dict[str, Any] shape the
+    model receives and their annotations declare.
+    """
+    status: str
+    report: str = ""
+    error_message: str = ""
+
+    def asdict(self) -> Dict[str, Any]:
+        """Convert to the dict sent back to the model."""
+        if self.status == "success":
+            return {"status": self.status, "report": self.report}
+        return {"status": self.status, "error_message": self.error_message}
+
+
+def _bmi_core(weight_kg: float, height_cm: float) -> float:
+    """Numeric core of calculate_bmi; height_cm must be positive."""
+    # Convert height from cm to meters
+    height_m = height_cm / 100
+    return weight_kg / (height_m * height_m)
+
 
 def calculate_bmi(weight_kg: float, height_cm: float) -> Dict[str, Any]:
     """Calculate BMI (Body Mass Index) and provide a health assessment.
@@ -13,33 +44,45 @@ def calculate_bmi(weight_kg: float, height_cm: float) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: status and result or error message
     """
-    try:
-        # Convert height from cm to meters
-        height_m = height_cm / 100
-        
-        # Calculate BMI
-        bmi = weight_kg / (height_m * height_m)
-        
-        # Determine BMI category
-        if bmi < 18.5:
-            category = "underweight"
-        elif 18.5 <= bmi < 25:
-            category = "normal weight"
-        elif 25 <= bmi < 30:
-            category = "overweight"
-        else:
-            category = "obese"
-        
-        report = (
-            f"Your BMI is {bmi:.1f}, which is classified as '{category}'. "
-            f"A healthy BMI range is between 18.5 and 24.9."
-        )
-        return {"status": "success", "report": report}
-    except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Error calculating BMI: {str(e)}"
-        }
+    if weight_kg <= 0:
+        return ToolResult("error", error_message="Weight must be greater than 0 kg.").asdict()
+    
+    if height_cm <= 0:
+        return ToolResult("error", error_message="Height must be greater than 0 cm.").asdict()
+    
+    bmi = _bmi_core(weight_kg, height_cm)
+    
+    # Determine BMI category
+    if bmi < 18.5:
+        category = "underweight"
+    elif 18.5 <= bmi < 25:
+        category = "normal weight"
+    elif 25 <= bmi < 30:
+        category = "overweight"
+    else:
+        category = "obese"
+    
+    report = (
+        f"Your BMI is {bmi:.1f}, which is classified as '{category}'. "
+        f"A healthy BMI range is between 18.5 and 24.9."
+    )
+    return ToolResult("success", report=report).asdict()
+
+
+# MET values (Metabolic Equivalent of Task) for different activities
+_MET_VALUES = MappingProxyType({
+    "walking": 3.5,
+    "jogging": 7.0,
+    "running": 10.0,
+    "cycling": 8.0,
+    "swimming": 6.0,
+    "weight lifting": 3.5,
+    "yoga": 2.5,
+    "hiit": 8.0,
+    "dancing": 4.5,
+    "hiking": 5.3,
+})
+_MET_KEYS_JOINED = ", ".join(_MET_VALUES)
 
 
 def calculate_calories_burned(activity: str, duration_min: int, weight_kg: float) -> Dict[str, Any]:
@@ -53,45 +96,84 @@ def calculate_calories_burned(activity: str, duration_min: int, weight_kg: float
     Returns:
         Dict[str, Any]: status and result or error message
     """
-    # MET values (Metabolic Equivalent of Task) for different activities
-    met_values = {
-        "walking": 3.5,
-        "jogging": 7.0,
-        "running": 10.0,
-        "cycling": 8.0,
-        "swimming": 6.0,
-        "weight lifting": 3.5,
-        "yoga": 2.5,
-        "hiit": 8.0,
-        "dancing": 4.5,
-        "hiking": 5.3,
-    }
-    
     activity = activity.lower()
     
-    if activity not in met_values:
-        return {
-            "status": "error",
-            "error_message": f"Activity '{activity}' is not supported. Supported activities are: {', '.join(met_values.keys())}"
-        }
+    if activity not in _MET_VALUES:
+        return ToolResult("error", error_message=f"Activity '{activity}' is not supported. Supported activities are: {_MET_KEYS_JOINED}").asdict()
     
-    try:
-        # Calculate calories burned using MET formula
-        # Calories = MET × weight (kg) × duration (hours)
-        met = met_values[activity]
-        duration_hours = duration_min / 60
-        calories = met * weight_kg * duration_hours
-        
-        report = (
-            f"For {duration_min} minutes of {activity}, a person weighing {weight_kg} kg "
-            f"would burn approximately {calories:.0f} calories."
-        )
-        return {"status": "success", "report": report}
-    except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Error calculating calories burned: {str(e)}"
-        }
+    if duration_min <= 0:
+        return ToolResult("error", error_message="Duration must be greater than 0 minutes.").asdict()
+    
+    if weight_kg <= 0:
+        return ToolResult("error", error_message="Weight must be greater than 0 kg.").asdict()
+    
+    # Calculate calories burned using MET formula
+    # Calories = MET × weight (kg) × duration (hours)
+    met = _MET_VALUES[activity]
+    duration_hours = duration_min / 60
+    calories = met * weight_kg * duration_hours
+    
+    report = (
+        f"For {duration_min} minutes of {activity}, a person weighing {weight_kg} kg "
+        f"would burn approximately {calories:.0f} calories."
+    )
+    return ToolResult("success", report=report).asdict()
+
+
+# Workout focus and schedule keyed by (fitness level, goal)
+_WORKOUT_PLANS: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("beginner", "weight loss"): (
+        "Full body workouts with cardio emphasis",
+        "2-3 full body workouts, 2-3 cardio sessions",
+    ),
+    ("beginner", "muscle gain"): (
+        "Full body resistance training",
+        "3 full body strength workouts, 1 active recovery day",
+    ),
+    ("beginner", "endurance"): (
+        "Cardio progression",
+        "2-3 cardio sessions, 1-2 light strength workouts",
+    ),
+    ("beginner", "general fitness"): (
+        "Balanced approach to fitness fundamentals",
+        "2 strength workouts, 2 cardio sessions, 1 flexibility day",
+    ),
+    ("intermediate", "weight loss"): (
+        "HIIT and circuit training",
+        "2-3 HIIT sessions, 2 strength circuits, 1 steady-state cardio",
+    ),
+    ("intermediate", "muscle gain"): (
+        "Upper/lower or push/pull/legs split",
+        "4-5 strength workouts following a split routine, 1 active recovery",
+    ),
+    ("intermediate", "endurance"): (
+        "Mixed cardio and endurance strength training",
+        "3-4 varied cardio sessions, 2 endurance-focused strength workouts",
+    ),
+    ("intermediate", "general fitness"): (
+        "Varied training methods",
+        "2-3 strength sessions, 2 cardio workouts, 1 flexibility/mobility day",
+    ),
+    ("advanced", "weight loss"): (
+        "Periodized training with caloric deficit",
+        "3-4 high-intensity workouts, 2 strength sessions, strategic cardio",
+    ),
+    ("advanced", "muscle gain"): (
+        "Specialized split routine",
+        "5-6 targeted strength sessions following a specialized split",
+    ),
+    ("advanced", "endurance"): (
+        "Periodized endurance program",
+        "4-5 structured cardio sessions, 2 complementary strength workouts",
+    ),
+    ("advanced", "general fitness"): (
+        "Periodized approach to all fitness components",
+        "3 strength sessions, 2-3 varied cardio/HIIT, 1 recovery/flexibility",
+    ),
+}
+
+_FITNESS_LEVELS = frozenset({"beginner", "intermediate", "advanced"})
+_GOALS = frozenset({"weight loss", "muscle gain", "endurance", "general fitness"})
 
 
 def create_workout_plan(fitness_level: str, goal: str, days_per_week: int) -> Dict[str, Any]:
@@ -105,103 +187,106 @@ def create_workout_plan(fitness_level: str, goal: str, days_per_week: int) -> Di
     Returns:
         Dict[str, Any]: status and result or error message
     """
-    if fitness_level.lower() not in ["beginner", "intermediate", "advanced"]:
-        return {
-            "status": "error",
-            "error_message": "Fitness level must be beginner, intermediate, or advanced."
-        }
+    if fitness_level.lower() not in _FITNESS_LEVELS:
+        return ToolResult("error", error_message="Fitness level must be beginner, intermediate, or advanced.").asdict()
     
-    if goal.lower() not in ["weight loss", "muscle gain", "endurance", "general fitness"]:
-        return {
-            "status": "error",
-            "error_message": "Goal must be weight loss, muscle gain, endurance, or general fitness."
-        }
+    if goal.lower() not in _GOALS:
+        return ToolResult("error", error_message="Goal must be weight loss, muscle gain, endurance, or general fitness.").asdict()
     
     if not 1 <= days_per_week <= 7:
-        return {
-            "status": "error",
-            "error_message": "Days per week must be between 1 and 7."
-        }
+        return ToolResult("error", error_message="Days per week must be between 1 and 7.").asdict()
     
     fitness_level = fitness_level.lower()
     goal = goal.lower()
     
-    # Generate workout plan based on inputs
-    workout_plans = {
-        "beginner": {
-            "weight loss": {
-                "focus": "Full body workouts with cardio emphasis",
-                "schedule": "2-3 full body workouts, 2-3 cardio sessions"
-            },
-            "muscle gain": {
-                "focus": "Full body resistance training",
-                "schedule": "3 full body strength workouts, 1 active recovery day"
-            },
-            "endurance": {
-                "focus": "Cardio progression",
-                "schedule": "2-3 cardio sessions, 1-2 light strength workouts" 
-            },
-            "general fitness": {
-                "focus": "Balanced approach to fitness fundamentals",
-                "schedule": "2 strength workouts, 2 cardio sessions, 1 flexibility day"
-            }
-        },
-        "intermediate": {
-            "weight loss": {
-                "focus": "HIIT and circuit training",
-                "schedule": "2-3 HIIT sessions, 2 strength circuits, 1 steady-state cardio" 
-            },
-            "muscle gain": {
-                "focus": "Upper/lower or push/pull/legs split",
-                "schedule": "4-5 strength workouts following a split routine, 1 active recovery"
-            },
-            "endurance": {
-                "focus": "Mixed cardio and endurance strength training",
-                "schedule": "3-4 varied cardio sessions, 2 endurance-focused strength workouts"
-            },
-            "general fitness": {
-                "focus": "Varied training methods",
-                "schedule": "2-3 strength sessions, 2 cardio workouts, 1 flexibility/mobility day"
-            }
-        },
-        "advanced": {
-            "weight loss": {
-                "focus": "Periodized training with caloric deficit",
-                "schedule": "3-4 high-intensity workouts, 2 strength sessions, strategic cardio"
-            },
-            "muscle gain": {
-                "focus": "Specialized split routine",
-                "schedule": "5-6 targeted strength sessions following a specialized split"
-            },
-            "endurance": {
-                "focus": "Periodized endurance program",
-                "schedule": "4-5 structured cardio sessions, 2 complementary strength workouts"
-            },
-            "general fitness": {
-                "focus": "Periodized approach to all fitness components",
-                "schedule": "3 strength sessions, 2-3 varied cardio/HIIT, 1 recovery/flexibility"
-            }
-        }
-    }
-    
-    plan = workout_plans[fitness_level][goal]
+    focus, schedule = _WORKOUT_PLANS[(fitness_level, goal)]
     
     # Adjust plan based on available days per week
     if days_per_week < 3:
         adjusted_schedule = "Focus on full-body workouts and combine cardio with strength when possible."
     elif days_per_week < 5:
-        adjusted_schedule = plan["schedule"] + " (Combine some workouts to fit your schedule)"
+        adjusted_schedule = schedule + " (Combine some workouts to fit your schedule)"
     else:
-        adjusted_schedule = plan["schedule"]
+        adjusted_schedule = schedule
     
     report = (
         f"Workout Plan for {fitness_level.capitalize()} Level with {goal.capitalize()} Goal ({days_per_week} days/week):\n"
-        f"• Focus: {plan['focus']}\n"
+        f"• Focus: {focus}\n"
         f"• Recommended Schedule: {adjusted_schedule}\n\n"
         f"For best results, ensure proper nutrition and recovery between workouts."
     )
     
-    return {"status": "success", "report": report}
+    return ToolResult("success", report=report).asdict()
+
+
+# Number of compounding periods per year for each supported frequency
+_COMPOUND_FREQS = MappingProxyType({
+    "annually": 1,
+    "semi-annually": 2,
+    "quarterly": 4,
+    "monthly": 12,
+    "daily": 365
+})
+_FREQ_KEYS_JOINED = ", ".join(_COMPOUND_FREQS)
+
+
+# Report returned by calculate_compound_interest
+_COMPOUND_REPORT_TMPL = (
+    "Investment Growth Projection:\n"
+    "• Initial investment: ${principal:,.2f}\n"
+    "• Interest rate: {annual_rate}% (compounded {compound_frequency})\n"
+    "• Time period: {years} years\n"
+    "• Additional contributions: ${contributions_per_year:,.2f} per year\n\n"
+    "• Final balance: ${final_amount:,.2f}\n"
+    "• Total contributions: ${total_contributions:,.2f}\n"
+    "• Interest earned: ${interest_earned:,.2f}\n"
+    "• Growth multiple: {growth_multiple:.2f}x"
+)
+
+
+@njit(
+    types.UniTuple(float64, 3)(float64, float64, int64, float64, float64),
+    cache=True,
+)
+def _compound_core(principal, r, n, years, contributions_per_year):
+    """Numeric core of calculate_compound_interest and calculate_compound_interest_batch.
+
+    Returns:
+        Tuple[float, float, float]: final amount, total contributions and interest earned
+    """
+    # Rate per compounding period, total number of periods and contribution per period
+    rate_per_period = r / n
+    periods = n * years
+    contribution_per_period = contributions_per_year / n
+
+    # Calculate final amount using compound interest formula with regular contributions
+    if rate_per_period == 0:
+        # No interest, so the balance is just what was put in
+        final_amount = principal + contributions_per_year * years
+    else:
+        # Growth factor is shared by the principal and the contributions
+        growth = (1.0 + rate_per_period) ** periods
+        final_amount = principal * growth
+
+        if contribution_per_period != 0:
+            # Future value of periodic contributions (Future Value of Annuity formula)
+            final_amount += contribution_per_period * ((growth - 1.0) / rate_per_period)
+
+    total_contributions = principal + contributions_per_year * years
+    interest_earned = final_amount - total_contributions
+    return final_amount, total_contributions, interest_earned
+
+
+@njit(
+    void(float64[:], float64[:], float64[:], float64[:], int64, float64[:, ::1]),
+    cache=True,
+)
+def _compound_batch_core(principals, annual_rates, years, contributions_per_year, n, out):
+    """Run _compound_core over flattened scenarios, writing one (final, contributions, interest) row each."""
+    for i in range(principals.shape[0]):
+        out[i, 0], out[i, 1], out[i, 2] = _compound_core(
+            principals[i], annual_rates[i] / 100, n, years[i], contributions_per_year[i]
+        )
 
 
 def calculate_compound_interest(principal: float, annual_rate: float, years: int, contributions_per_year: float = 0.0, compound_frequency: str = "annually") -> Dict[str, Any]:
@@ -217,65 +302,120 @@ def calculate_compound_interest(principal: float, annual_rate: float, years: int
     Returns:
         Dict[str, Any]: status and result or error message
     """
-    frequencies = {
-        "annually": 1,
-        "semi-annually": 2,
-        "quarterly": 4,
-        "monthly": 12,
-        "daily": 365
-    }
-    
-    if compound_frequency.lower() not in frequencies:
-        return {
-            "status": "error",
-            "error_message": f"Invalid compound frequency. Choose from: {', '.join(frequencies.keys())}"
-        }
+    if compound_frequency.lower() not in _COMPOUND_FREQS:
+        return ToolResult("error", error_message=f"Invalid compound frequency. Choose from: {_FREQ_KEYS_JOINED}").asdict()
     
     try:
         # Get number of times compounded per year
-        n = frequencies[compound_frequency.lower()]
+        n = _COMPOUND_FREQS[compound_frequency.lower()]
         
         # Convert annual rate to decimal
         r = annual_rate / 100
+
+        final_amount, total_contributions, interest_earned = _compound_core(
+            float(principal), float(r), n, float(years), float(contributions_per_year)
+        )
         
-        # Calculate contribution per period
-        contribution_per_period = contributions_per_year / n
-        
-        # Calculate final amount using compound interest formula with regular contributions
-        if contribution_per_period == 0:
-            # Without additional contributions
-            final_amount = principal * (1 + r/n)**(n*years)
-        else:
-            # With regular contributions (using Future Value of Annuity formula)
-            # First calculate growth of principal
-            principal_growth = principal * (1 + r/n)**(n*years)
-            
-            # Then calculate future value of periodic contributions
-            contribution_growth = contribution_per_period * (((1 + r/n)**(n*years) - 1) / (r/n))
-            
-            final_amount = principal_growth + contribution_growth
-        
-        total_contributions = principal + (contributions_per_year * years)
-        interest_earned = final_amount - total_contributions
-        
-        report = (
-            f"Investment Growth Projection:\n"
-            f"• Initial investment: ${principal:,.2f}\n"
-            f"• Interest rate: {annual_rate}% (compounded {compound_frequency})\n"
-            f"• Time period: {years} years\n"
-            f"• Additional contributions: ${contributions_per_year:,.2f} per year\n\n"
-            f"• Final balance: ${final_amount:,.2f}\n"
-            f"• Total contributions: ${total_contributions:,.2f}\n"
-            f"• Interest earned: ${interest_earned:,.2f}\n"
-            f"• Growth multiple: {final_amount/principal:.2f}x"
+        report = _COMPOUND_REPORT_TMPL.format(
+            principal=principal,
+            annual_rate=annual_rate,
+            compound_frequency=compound_frequency,
+            years=years,
+            contributions_per_year=contributions_per_year,
+            final_amount=final_amount,
+            total_contributions=total_contributions,
+            interest_earned=interest_earned,
+            growth_multiple=final_amount / principal,
         )
         
-        return {"status": "success", "report": report}
+        return ToolResult("success", report=report).asdict()
     except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Error calculating compound interest: {str(e)}"
-        }
+        return ToolResult("error", error_message=f"Error calculating compound interest: {str(e)}").asdict()
+
+
+# Fields of the structured array returned by calculate_compound_interest_batch
+_COMPOUND_BATCH_DTYPE = np.dtype([
+    ("final_amount", np.float64),
+    ("total_contributions", np.float64),
+    ("interest_earned", np.float64),
+])
+
+
+def calculate_compound_interest_batch(principals: Any, annual_rates: Any, years: Any, contributions_per_year: Any = 0.0, compound_frequency: str = "annually") -> np.ndarray:
+    """Calculate compound interest growth for many scenarios at once.
+
+    Inputs are broadcast against each other like NumPy arrays, so for example
+    rates of shape (R, 1) and years of shape (Y,) give an (R, Y) grid of scenarios.
+    This is a plain Python API for scenario sweeps and is not registered as an
+    agent tool; calculate_compound_interest remains the scalar tool.
+
+    Args:
+        principals (array-like): Initial investment amounts
+        annual_rates (array-like): Annual interest rates (as percentages, e.g., 7 for 7%)
+        years (array-like): Investment time horizons in years
+        contributions_per_year (array-like, optional): Additional contributions per year. Defaults to 0.0.
+        compound_frequency (str, optional): Compounding frequency (annually, quarterly, monthly, daily). Defaults to "annually".
+
+    Returns:
+        np.ndarray: structured array with final_amount, total_contributions and interest_earned fields
+
+    Raises:
+        ValueError: if compound_frequency is not supported
+    """
+    n = _COMPOUND_FREQS.get(compound_frequency.lower())
+    if n is None:
+        raise ValueError(f"Invalid compound frequency. Choose from: {_FREQ_KEYS_JOINED}")
+    
+    principals, annual_rates, years, contributions_per_year = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (principals, annual_rates, years, contributions_per_year))
+    )
+    
+    # Every scenario goes through the same compiled core as the scalar tool
+    out = np.empty((principals.size, 3), dtype=np.float64)
+    _compound_batch_core(
+        principals.ravel(), annual_rates.ravel(), years.ravel(), contributions_per_year.ravel(), n, out
+    )
+    return out.view(_COMPOUND_BATCH_DTYPE).reshape(principals.shape)
+
+
+# Asset classes in the order they are reported by analyze_investment_portfolio
+_ASSET_ORDER = ("stocks", "bonds", "cash", "real estate", "commodities", "cryptocurrency")
+_ASSET_CLASSES = frozenset(_ASSET_ORDER)
+
+# Recommended (min, max) allocation percentages per risk tolerance, aligned with _ASSET_ORDER
+_RECOMMENDED_ALLOCATIONS = {
+    "low": (
+        np.array([20, 40, 10, 0, 0, 0]),
+        np.array([40, 60, 25, 10, 5, 0]),
+    ),
+    "moderate": (
+        np.array([40, 25, 5, 5, 0, 0]),
+        np.array([60, 40, 15, 15, 10, 5]),
+    ),
+    "high": (
+        np.array([60, 10, 0, 5, 0, 0]),
+        np.array([80, 30, 10, 20, 15, 10]),
+    ),
+}
+
+_RISK_LEVELS = frozenset(_RECOMMENDED_ALLOCATIONS)
+
+# Report lines indexed by comparison result: 0 = within range, 1 = below, 2 = above
+_ALLOCATION_LINES = (
+    "• {asset}: {current}% (Within recommended range of {low}-{high}%)",
+    "• {asset}: {current}% (Consider increasing to {low}-{high}%)",
+    "• {asset}: {current}% (Consider decreasing to {low}-{high}%)",
+)
+
+# Report returned by analyze_investment_portfolio
+_PORTFOLIO_REPORT_TMPL = (
+    "Portfolio Analysis for {risk_tolerance} Risk Tolerance:\n\n"
+    "Current Allocation vs. Recommended Range:\n"
+    "{analysis}\n\n"
+    "Observations:\n"
+    "{observations}\n\n"
+    "Note: This is a simplified analysis. Consider consulting a financial advisor for personalized advice."
+)
 
 
 def analyze_investment_portfolio(allocation: Dict[str, float], risk_tolerance: str) -> Dict[str, Any]:
@@ -288,72 +428,39 @@ def analyze_investment_portfolio(allocation: Dict[str, float], risk_tolerance: s
     Returns:
         Dict[str, Any]: status and result or error message
     """
-    valid_asset_classes = ["stocks", "bonds", "cash", "real estate", "commodities", "cryptocurrency"]
-    valid_risk_levels = ["low", "moderate", "high"]
-    
     risk_tolerance = risk_tolerance.lower()
-    if risk_tolerance not in valid_risk_levels:
-        return {
-            "status": "error",
-            "error_message": f"Invalid risk tolerance. Choose from: {', '.join(valid_risk_levels)}"
-        }
+    if risk_tolerance not in _RISK_LEVELS:
+        return ToolResult("error", error_message=f"Invalid risk tolerance. Choose from: {', '.join(_RECOMMENDED_ALLOCATIONS)}").asdict()
     
     # Validate asset classes
     for asset in allocation:
-        if asset.lower() not in valid_asset_classes:
-            return {
-                "status": "error",
-                "error_message": f"Invalid asset class '{asset}'. Valid classes are: {', '.join(valid_asset_classes)}"
-            }
+        if asset.lower() not in _ASSET_CLASSES:
+            return ToolResult("error", error_message=f"Invalid asset class '{asset}'. Valid classes are: {', '.join(_ASSET_ORDER)}").asdict()
     
     # Check if allocation sums to approximately 100%
     total_allocation = sum(allocation.values())
-    if not 99 <= total_allocation <= 101:
-        return {
-            "status": "error",
-            "error_message": f"Portfolio allocation should sum to 100%. Current total: {total_allocation}%"
-        }
+    if not abs(total_allocation - 100.0) <= 1.0:
+        return ToolResult("error", error_message=f"Portfolio allocation should sum to 100%. Current total: {total_allocation}%").asdict()
     
-    # Recommended allocations based on risk tolerance
-    recommended_allocations = {
-        "low": {
-            "stocks": (20, 40),
-            "bonds": (40, 60),
-            "cash": (10, 25),
-            "real estate": (0, 10),
-            "commodities": (0, 5),
-            "cryptocurrency": (0, 0)
-        },
-        "moderate": {
-            "stocks": (40, 60),
-            "bonds": (25, 40),
-            "cash": (5, 15),
-            "real estate": (5, 15),
-            "commodities": (0, 10),
-            "cryptocurrency": (0, 5)
-        },
-        "high": {
-            "stocks": (60, 80),
-            "bonds": (10, 30),
-            "cash": (0, 10),
-            "real estate": (5, 20),
-            "commodities": (0, 15),
-            "cryptocurrency": (0, 10)
-        }
-    }
+    # Asset names are case-insensitive, so sum entries that differ only in case
+    merged: Dict[str, float] = {}
+    for asset, percentage in allocation.items():
+        merged[asset.lower()] = merged.get(asset.lower(), 0) + percentage
+    allocation = merged
     
-    # Analyze current allocation compared to recommendations
-    analysis = []
-    for asset in valid_asset_classes:
-        current = allocation.get(asset, 0)
-        min_recommended, max_recommended = recommended_allocations[risk_tolerance].get(asset, (0, 0))
-        
-        if current < min_recommended:
-            analysis.append(f"• {asset.capitalize()}: {current}% (Consider increasing to {min_recommended}-{max_recommended}%)")
-        elif current > max_recommended:
-            analysis.append(f"• {asset.capitalize()}: {current}% (Consider decreasing to {min_recommended}-{max_recommended}%)")
-        else:
-            analysis.append(f"• {asset.capitalize()}: {current}% (Within recommended range of {min_recommended}-{max_recommended}%)")
+    # Current allocation as a vector aligned with _ASSET_ORDER
+    values = [allocation.get(asset, 0) for asset in _ASSET_ORDER]
+    current = np.array(values, dtype=float)
+    
+    # Analyze current allocation compared to recommendations in one vectorized pass
+    mins, maxs = _RECOMMENDED_ALLOCATIONS[risk_tolerance]
+    line_index = np.where(current < mins, 1, np.where(current > maxs, 2, 0))
+    analysis = [
+        _ALLOCATION_LINES[line_index[i]].format(
+            asset=asset.capitalize(), current=values[i], low=mins[i], high=maxs[i]
+        )
+        for i, asset in enumerate(_ASSET_ORDER)
+    ]
     
     # General portfolio observations
     observations = []
@@ -362,61 +469,33 @@ def analyze_investment_portfolio(allocation: Dict[str, float], risk_tolerance: s
     cash_percentage = allocation.get("cash", 0)
     
     if risk_tolerance == "low" and stocks_percentage > 40:
-        observations.append("Your stock allocation is high for your risk tolerance.")
+        observations.append("• Your stock allocation is high for your risk tolerance.")
     elif risk_tolerance == "high" and stocks_percentage < 50:
-        observations.append("Your stock allocation is low for your risk tolerance.")
+        observations.append("• Your stock allocation is low for your risk tolerance.")
         
     if cash_percentage > 20:
-        observations.append("High cash allocation may result in potential missed growth opportunities.")
+        observations.append("• High cash allocation may result in potential missed growth opportunities.")
     
     if bonds_percentage < 10 and risk_tolerance != "high":
-        observations.append("Consider increasing bond allocation for better stability.")
+        observations.append("• Consider increasing bond allocation for better stability.")
     
-    report = (
-        f"Portfolio Analysis for {risk_tolerance.capitalize()} Risk Tolerance:\n\n"
-        f"Current Allocation vs. Recommended Range:\n"
-        f"{chr(10).join(analysis)}\n\n"
-        f"Observations:\n"
-        f"{chr(10).join(['• ' + obs for obs in observations]) if observations else '• Your allocation generally aligns with your risk tolerance.'}\n\n"
-        f"Note: This is a simplified analysis. Consider consulting a financial advisor for personalized advice."
+    report = _PORTFOLIO_REPORT_TMPL.format(
+        risk_tolerance=risk_tolerance.capitalize(),
+        analysis="\n".join(analysis),
+        observations="\n".join(observations) if observations else "• Your allocation generally aligns with your risk tolerance.",
     )
     
-    return {"status": "success", "report": report}
-
+    return ToolResult("success", report=report).asdict()
 
-# Define the agents
-fitness_agent = Agent(
-    name="fitness_coach",
-    model="gemini-1.5-pro",
-    description=(
-        "Agent to help with fitness tracking, workout planning, and health metrics calculation. "
-        "Provides personalized advice based on user's fitness level and goals."
-    ),
-    instruction=(
-        "I can calculate health metrics like BMI and calories burned, create personalized "
-        "workout plans, and provide fitness advice based on your specific needs and goals."
-    ),
-    tools=[calculate_bmi, calculate_calories_burned, create_workout_plan],
-)
-
-wealth_agent = Agent(
-    name="wealth_advisor",
-    model="gemini-1.5-pro",
-    description=(
-        "Agent to help with financial planning, investment analysis, and wealth building strategies. "
-        "Provides guidance on investment growth and portfolio management."
-    ),
-    instruction=(
-        "I can help you project investment growth using compound interest calculations, "
-        "analyze your investment portfolio allocation, and provide guidance on wealth building strategies."
-    ),
-    tools=[calculate_compound_interest, analyze_investment_portfolio],
-)
 
-# Create a root agent that combines both fitness and wealth tools
+# Define the agent
 root_agent = Agent(
     name="wellness_advisor",
     model="gemini-1.5-pro",
+    # Deterministic output so identical prompts can safely share cached responses
+    generate_content_config=genai_types.GenerateContentConfig(temperature=0),
+    # Serve tool calls that were already started speculatively from the prompt
+    before_tool_callback=use_speculated_result,
     description=(
         "Agent to help with both physical and financial wellness. "
         "Provides guidance on fitness, health metrics, investment planning, and wealth building."
@@ -0,0 +1,196 @@
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .agent import (
+    _MET_VALUES,
+    calculate_bmi,
+    calculate_calories_burned,
+    calculate_compound_interest,
+)
+from .speculation import submit_speculative_call
+
+# Keyword gates deciding which tool, if any, a prompt is asking for
+_BMI_RE = re.compile(r"\bbmi\b|\bbody mass index\b", re.I)
+_CALORIES_RE = re.compile(r"\bcalories\b", re.I)
+_COMPOUND_RE = re.compile(r"\bcompound interest\b|\binvest(?:ment|ing)?\b|\bgrow(?:th)?\b", re.I)
+
+# Prompts that need the agent's judgement even when a tool call can be predicted
+_ADVICE_RE = re.compile(r"\bshould\b|\brecommend|\badvi[cs]e\b|\bbetter\b|\bworth it\b|\benough\b|\bsuggest|\bexplain\b|\bwhy\b", re.I)
+
+# Prompts asking more than one question or comparing scenarios
+_MULTI_INTENT_RE = re.compile(r"\bvs\b\.?|\bversus\b|\band how\b|\bcompar(?:e|ed|ing)\b", re.I)
+
+# Wording that describes losses, which calculate_compound_interest cannot express
+_LOSS_RE = re.compile(r"\b(?:lost|lose|loses|losing|loss|losses|declin(?:e|ed|es|ing)|drop(?:ped|s)?|fell|fall(?:s|ing)?)\b", re.I)
+
+# Borrowing, which calculate_compound_interest does not model
+_DEBT_RE = re.compile(r"\bloans?\b|\bmortgages?\b|\bdebts?\b|\bborrow\w*|\bpay(?:ing)? off\b", re.I)
+
+# Recurring contributions such as "$100 per month"; wording about contributions
+# that does not match this pattern makes the contribution amount unpredictable
+_CONTRIBUTION_RE = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)\s*(?:per|a|each|every)\s+(year|month)\b", re.I)
+_CONTRIBUTION_WORDS_RE = re.compile(r"\bcontribut\w*|\bdeposit\w*|\badd(?:s|ing)?\b|\bsav(?:e|es|ing)\b", re.I)
+
+# "per year" qualifies a rate or contribution rather than giving a duration
+_PER_YEAR_RE = re.compile(r"\b(?:per|a|each|every)\s+year\b", re.I)
+
+# Activities recognised by calculate_calories_burned, longest first so "weight lifting" wins over shorter names
+_ACTIVITY_RE = re.compile(
+    r"\b(" + "|".join(re.escape(a) for a in sorted(_MET_VALUES, key=len, reverse=True)) + r")\b",
+    re.I,
+)
+_FREQUENCY_RE = re.compile(r"\b(annually|semi-annually|quarterly|monthly|daily)\b", re.I)
+
+
+def _unit_re(units: str) -> re.Pattern:
+    """Match a mention of a unit, capturing the number written directly before it if there is one."""
+    return re.compile(r"(?:(\d[\d,]*(?:\.\d+)?)\s*)?(?<![a-z])(?:" + units + r")\b", re.I)
+
+
+# Units used to tell extracted numbers apart
+_KG_RE = _unit_re(r"kgs?|kilograms?")
+_CM_RE = _unit_re(r"cm|centimet(?:er|re)s?")
+_MINUTES_RE = _unit_re(r"mins?|minutes?")
+_YEARS_RE = _unit_re(r"years?")
+
+# Dollar amounts and percentages
+_DOLLAR_RE = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)")
+_PERCENT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*%")
+
+# Numbers the parsers would misread: a leading minus or range dash ("-5%", "5-10 years")
+# or a magnitude suffix ("$10k", "$1.5 million")
+_UNREADABLE_NUMBER_RE = re.compile(
+    r"[-\u2212\u2013]\s*\$?\s*\d"
+    r"|\d\s*(?:k|m|mm|bn|b|thousand|million|billion|trillion|grand)\b",
+    re.I,
+)
+
+# Time units that split a duration across units ("2 years and 6 months", "1 hour 30 minutes")
+_HOURS_RE = _unit_re(r"hours?|hrs?")
+_SECONDS_RE = _unit_re(r"secs?|seconds?")
+_SUB_YEAR_RE = _unit_re(r"months?|weeks?|days?")
+
+
+def _parse_number(text: str) -> float:
+    """Parse a number as written, keeping whole numbers as int so reports echo "5%" rather than "5.0%"."""
+    text = text.replace(",", "")
+    return float(text) if "." in text else int(text)
+
+
+def _single_value(prompt: str, unit_re: re.Pattern) -> Optional[float]:
+    """Return the number written directly before a unit, if the unit is mentioned exactly once."""
+    matches = unit_re.findall(prompt)
+    if len(matches) != 1 or not matches[0]:
+        return None
+    return _parse_number(matches[0])
+
+
+def _parse_bmi(prompt: str) -> Optional[Dict[str, Any]]:
+    weight_kg = _single_value(prompt, _KG_RE)
+    height_cm = _single_value(prompt, _CM_RE)
+    if weight_kg is None or height_cm is None:
+        return None
+    return {"weight_kg": weight_kg, "height_cm": height_cm}
+
+
+def _parse_calories(prompt: str) -> Optional[Dict[str, Any]]:
+    if _HOURS_RE.search(prompt) or _SECONDS_RE.search(prompt):
+        return None
+    activities = {activity.lower() for activity in _ACTIVITY_RE.findall(prompt)}
+    duration_min = _single_value(prompt, _MINUTES_RE)
+    weight_kg = _single_value(prompt, _KG_RE)
+    if len(activities) != 1 or duration_min is None or weight_kg is None:
+        return None
+    return {"activity": activities.pop(), "duration_min": duration_min, "weight_kg": weight_kg}
+
+
+def _parse_compound_interest(prompt: str) -> Optional[Dict[str, Any]]:
+    if _LOSS_RE.search(prompt) or _DEBT_RE.search(prompt):
+        return None
+
+    contributions = _CONTRIBUTION_RE.findall(prompt)
+    if len(contributions) > 1 or (not contributions and _CONTRIBUTION_WORDS_RE.search(prompt)):
+        return None
+    contributions_per_year = 0.0
+    if contributions:
+        amount, period = contributions[0]
+        contributions_per_year = _parse_number(amount) * (12 if period.lower() == "month" else 1)
+
+    # A number of months, weeks or days next to the years would be dropped
+    if any(_SUB_YEAR_RE.findall(prompt)):
+        return None
+
+    # The principal is the one dollar amount that is not a recurring contribution
+    remainder = _CONTRIBUTION_RE.sub(" ", prompt)
+    amounts = _DOLLAR_RE.findall(remainder)
+    rates = _PERCENT_RE.findall(prompt)
+    years = _single_value(_PER_YEAR_RE.sub(" ", remainder), _YEARS_RE)
+    frequencies = {frequency.lower() for frequency in _FREQUENCY_RE.findall(prompt)}
+    if len(amounts) != 1 or len(rates) != 1 or years is None or len(frequencies) > 1:
+        return None
+    return {
+        "principal": _parse_number(amounts[0]),
+        "annual_rate": _parse_number(rates[0]),
+        "years": years,
+        "contributions_per_year": contributions_per_year,
+        "compound_frequency": frequencies.pop() if frequencies else "annually",
+    }
+
+
+# Keyword gate, tool and argument parser for each tool the router can predict
+_ROUTES = (
+    (_BMI_RE, calculate_bmi, _parse_bmi),
+    (_CALORIES_RE, calculate_calories_burned, _parse_calories),
+    (_COMPOUND_RE, calculate_compound_interest, _parse_compound_interest),
+)
+
+
+def predict_tool_call(prompt: str) -> Optional[Tuple[Callable[..., Dict[str, Any]], Dict[str, Any]]]:
+    """Predict the tool call the agent would make for a prompt.
+
+    Args:
+        prompt (str): The user's query
+
+    Returns:
+        Optional[Tuple[Callable, Dict[str, Any]]]: the tool and its arguments, or None unless
+            exactly one tool matches and every argument has a single candidate in the prompt
+    """
+    if _MULTI_INTENT_RE.search(prompt) or _UNREADABLE_NUMBER_RE.search(prompt):
+        return None
+    matches = [(tool, parse) for gate, tool, parse in _ROUTES if gate.search(prompt)]
+    if len(matches) != 1:
+        return None
+    tool, parse = matches[0]
+    args = parse(prompt)
+    return (tool, args) if args is not None else None
+
+
+def fast_route(prompt: str) -> Optional[str]:
+    """Answer simple single-tool prompts directly, skipping the LLM round-trips.
+
+    Args:
+        prompt (str): The user's query
+
+    Returns:
+        Optional[str]: the tool report, or None if the prompt should go to the agent
+    """
+    if _ADVICE_RE.search(prompt):
+        return None
+    prediction = predict_tool_call(prompt)
+    if prediction is None:
+        return None
+    tool, args = prediction
+    result = tool(**args)
+    return result["report"] if result["status"] == "success" else None
+
+
+def speculate(prompt: str) -> None:
+    """Start the tool call the agent is likely to make for a prompt while the model is still decoding.
+
+    Only prompts whose arguments can all be read from the text are
+    speculated on. The result is handed to the agent by use_speculated_result
+    if the model ends up choosing the same call, and is discarded otherwise.
+    """
+    prediction = predict_tool_call(prompt)
+    if prediction is not None:
+        submit_speculative_call(*prediction)
@@ -0,0 +1,87 @@
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Maximum number of unclaimed speculative results kept before the oldest are dropped
+_MAX_PENDING = 64
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculative_tool")
+_pending: "OrderedDict[Tuple, Future]" = OrderedDict()
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _signature(func: Callable) -> inspect.Signature:
+    """Signature of a tool, looked up once per function."""
+    return inspect.signature(func)
+
+
+def _call_key(func: Callable, args: Dict[str, Any]) -> Optional[Tuple]:
+    """Build a hashable key identifying a tool call, or None if the call cannot be keyed.
+
+    Defaults are filled in and numbers and strings normalized so that a call
+    predicted from the prompt matches the equivalent call chosen by the model.
+    """
+    try:
+        bound = _signature(func).bind(**args)
+    except TypeError:
+        return None
+    bound.apply_defaults()
+
+    values = []
+    for name, value in bound.arguments.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+        elif isinstance(value, str):
+            value = value.lower()
+        values.append((name, value))
+    key = (func.__name__, tuple(values))
+
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def submit_speculative_call(func: Callable, args: Dict[str, Any]) -> None:
+    """Start a tool call in the background before the model has asked for it."""
+    key = _call_key(func, args)
+    if key is None:
+        return
+    future = _executor.submit(func, **args)
+    with _lock:
+        _pending[key] = future
+        while len(_pending) > _MAX_PENDING:
+            _pending.popitem(last=False)
+
+
+def use_speculated_result(tool: Any, args: Dict[str, Any], tool_context: Any) -> Optional[Any]:
+    """before_tool_callback returning a speculated result when the model's call matches one.
+
+    ADK calls this on the event loop, so it never waits on the worker thread:
+    a speculated call that has not finished yet is dropped. Returning None
+    lets ADK run the tool normally.
+    """
+    # Most tool calls were never speculated on; skip building their key
+    if not _pending:
+        return None
+    func = getattr(tool, "func", None)
+    if func is None:
+        return None
+    key = _call_key(func, args)
+    if key is None:
+        return None
+    with _lock:
+        future = _pending.pop(key, None)
+    if future is None:
+        return None
+    if not future.done():
+        future.cancel()
+        return None
+    if future.exception() is not None:
+        return None
+    return future.result()
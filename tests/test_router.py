@@ -0,0 +1,86 @@
+import pytest
+
+from multi_tool_agent.agent import calculate_bmi, calculate_calories_burned, calculate_compound_interest
+from multi_tool_agent.router import fast_route, predict_tool_call
+
+
+@pytest.mark.parametrize(
+    "prompt, tool, args",
+    [
+        (
+            "What is my BMI if I weigh 70 kg and am 175 cm tall?",
+            calculate_bmi,
+            {"weight_kg": 70, "height_cm": 175},
+        ),
+        (
+            "How many calories do I burn running for 30 minutes at 70 kg?",
+            calculate_calories_burned,
+            {"activity": "running", "duration_min": 30, "weight_kg": 70},
+        ),
+        (
+            "Project growth of $10,000 at 7% compounded monthly for 20 years",
+            calculate_compound_interest,
+            {
+                "principal": 10000,
+                "annual_rate": 7,
+                "years": 20,
+                "contributions_per_year": 0.0,
+                "compound_frequency": "monthly",
+            },
+        ),
+        (
+            "Invest $10,000 at 7% per year for 20 years, adding $100 per month",
+            calculate_compound_interest,
+            {
+                "principal": 10000,
+                "annual_rate": 7,
+                "years": 20,
+                "contributions_per_year": 1200,
+                "compound_frequency": "annually",
+            },
+        ),
+    ],
+)
+def test_predicts_fully_specified_calls(prompt, tool, args):
+    assert predict_tool_call(prompt) == (tool, args)
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        # Magnitude suffixes
+        "Project growth of $10k at 5% for 10 years",
+        "Project growth of $1.5 million at 5% for 10 years",
+        # Negative rates and ranges
+        "How much will $1000 grow at -5% for 10 years?",
+        "How much will $1000 grow at 5% for 5-10 years?",
+        # Durations split across units
+        "How much will $1000 grow at 5% for 2 years and 6 months?",
+        "Calories burned in 1 hour 30 minutes of running at 70 kg?",
+        # Several intents or scenarios
+        "How much will $1000 at 5% for 10 years vs 20 years grow?",
+        "Compare investing $1000 at 5% for 10 years with paying off debt",
+        "BMI at 80 kg and 180 cm, and how many calories do I burn running 30 minutes?",
+        "Calories burned running then swimming for 30 minutes at 70 kg?",
+        # Losses and borrowing
+        "My investment of $5000 lost 20% over 2 years, what is it worth now?",
+        "Calculate monthly payment for a $300,000 loan with 4.5% interest over 30 years",
+        # Values the parsers cannot read
+        "What is 5 feet 11 in cm? I weigh 80 kg, BMI?",
+        "Invest $10,000 at 7% for 20 years and keep contributing",
+        "Convert 100 USD to EUR",
+    ],
+)
+def test_declines_ambiguous_prompts(prompt):
+    assert predict_tool_call(prompt) is None
+    assert fast_route(prompt) is None
+
+
+def test_fast_route_returns_tool_report():
+    assert fast_route("What is my BMI at 80kg and 180cm?").startswith("Your BMI is 24.7")
+
+
+def test_fast_route_leaves_advice_to_the_agent():
+    prompt = "Should I invest $10,000 at 7% for 20 years, adding $100 per month?"
+    assert predict_tool_call(prompt) is not None
+    assert fast_route(prompt) is None